@@ -27,6 +27,9 @@ try:
 except ImportError:
     MOVIEPY_AVAILABLE = False
 
+# Move the moov atom to the front so browsers can start playback before the full download
+FASTSTART_PARAMS = ['-movflags', '+faststart']
+
 class ObjectTracker:
     def __init__(self, use_yolo=True, confidence=0.15, max_distance=50):
         self.use_yolo = use_yolo and YOLO_AVAILABLE
@@ -224,45 +227,69 @@ def draw_dashed_line(frame, pt1, pt2, color, thickness, dash_length):
         end_y = int(pt1[1] + (pt2[1] - pt1[1]) * end_ratio)
         cv2.line(frame, (start_x, start_y), (end_x, end_y), color, thickness)
 
-def merge_audio(input_video, output_video_no_audio, final_output):
-    """Original audio merging function"""
+def merge_audio(input_video, output_video_no_audio, final_output, status_callback=None):
+    """Original audio merging function
+
+    Returns True if the final output was re-encoded to browser-playable H.264,
+    False if the raw OpenCV mp4v file was kept instead.
+    """
     if not MOVIEPY_AVAILABLE:
         print("MoviePy not available. Output video will have no audio.")
         try:
             os.rename(output_video_no_audio, final_output)
         except:
             pass
-        return
+        return False
 
+    original = None
+    processed = None
     try:
-        original = VideoFileClip(input_video)
-        processed = VideoFileClip(output_video_no_audio)
-        if original.audio is not None:
-            final_video = processed.set_audio(original.audio)
-            final_video.write_videofile(final_output, verbose=False, logger=None)
-            final_video.close()
-        else:
-            processed.close()
-            os.rename(output_video_no_audio, final_output)
-        original.close()
-        processed.close()
+        try:
+            original = VideoFileClip(input_video)
+            processed = VideoFileClip(output_video_no_audio)
+            if original.audio is not None:
+                if status_callback:
+                    status_callback("Merging audio and encoding for browser playback...")
+                final_video = processed.set_audio(original.audio)
+                try:
+                    final_video.write_videofile(final_output, ffmpeg_params=FASTSTART_PARAMS, verbose=False, logger=None)
+                finally:
+                    final_video.close()
+            else:
+                # Re-encode to H.264 so browsers can play the result inline
+                if status_callback:
+                    status_callback("Encoding for browser playback...")
+                processed.write_videofile(final_output, audio=False, ffmpeg_params=FASTSTART_PARAMS, verbose=False, logger=None)
+        finally:
+            # Release the file handles before the fallback rename below (required on Windows)
+            if original is not None:
+                original.close()
+            if processed is not None:
+                processed.close()
         if os.path.exists(output_video_no_audio):
             os.remove(output_video_no_audio)
+        return True
     except Exception as e:
         print(f"Audio merging failed: {e}")
         print("Saving video without audio...")
         try:
+            # Drop any partial file left by the failed encode, rename won't overwrite it on Windows
+            if os.path.exists(final_output):
+                os.remove(final_output)
             os.rename(output_video_no_audio, final_output)
         except:
             pass
+        return False
 
 class VideoProcessor:
-    def __init__(self):
+    def __init__(self, job_id=None):
+        self.job_id = job_id
         self.progress = 0
         self.message = "Initializing..."
         self.current_frame = 0
         self.total_frames = 0
         self.output_file = None
+        self.playable = False
         self.completed = False
         self.success = False
         self.error = None
@@ -271,6 +298,7 @@ class VideoProcessor:
         """Modified processing function for web integration"""
         self.completed = False
         self.success = False
+        self.playable = False
         self.error = None
         self.progress = 0
         self.current_frame = 0
@@ -381,12 +409,23 @@ class VideoProcessor:
                 self.completed = True
                 return False
 
-            # Merge audio
-            self.update_progress(85, "Merging audio...")
+            # Merge audio and encode for browser playback
+            self.update_progress(85, "Finalizing video...")
 
-            merge_audio(input_path, temp_output, output_path)
+            self.playable = merge_audio(
+                input_path, temp_output, output_path,
+                status_callback=lambda message: self.update_progress(85, message)
+            )
 
-            self.update_progress(100, "Processing complete!")
+            if not os.path.exists(output_path):
+                self.error = "Could not write output video file"
+                self.completed = True
+                return False
+
+            if self.playable:
+                self.update_progress(100, "Processing complete!")
+            else:
+                self.update_progress(100, "Processing complete! (not playable in browser, download to view)")
 
             self.completed = True
             self.success = True
@@ -410,7 +449,9 @@ class VideoProcessor:
             'message': self.message,
             'completed': self.completed,
             'success': self.success,
+            'playable': self.playable,
             'error': self.error,
+            'job_id': self.job_id,
             'output_file': self.output_file,
             'current_frame': self.current_frame,
             'total_frames': self.total_frames
@@ -3,6 +3,8 @@ class ProjectObjectify {
         this.currentScreen = 'upload';
         this.uploadedFile = null;
         this.outputFile = null;
+        this.jobId = null;
+        this.playable = false;
         this.processingInterval = null;
 
         this.init();
@@ -28,6 +30,7 @@ class ProjectObjectify {
         document.getElementById('download-btn').addEventListener('click', this.downloadVideo.bind(this));
         document.getElementById('new-btn').addEventListener('click', this.resetToUpload.bind(this));
         document.getElementById('restart-btn').addEventListener('click', this.resetToUpload.bind(this));
+        document.getElementById('video-player').addEventListener('error', this.handlePlayerError.bind(this));
     }
 
     setupAnimatedGrid() {
@@ -190,6 +193,8 @@ class ProjectObjectify {
                     clearInterval(this.processingInterval);
                     if (data.success) {
                         this.outputFile = data.output_file;
+                        this.jobId = data.job_id;
+                        this.playable = data.playable;
                         this.showComplete();
                     } else {
                         this.showError(data.error || 'Processing failed');
@@ -223,6 +228,10 @@ class ProjectObjectify {
         if (this.outputFile) {
             document.getElementById('output-info').textContent = `Output: ${this.outputFile}`;
         }
+
+        const playBtn = document.getElementById('play-btn');
+        playBtn.disabled = !this.playable;
+        playBtn.title = this.playable ? '' : 'This video cannot be played in the browser, download it instead';
     }
 
     showError(message) {
@@ -248,6 +257,9 @@ class ProjectObjectify {
         this.updateStatus('READY');
         this.uploadedFile = null;
         this.outputFile = null;
+        this.jobId = null;
+        this.playable = false;
+        this.resetPlayer();
         document.getElementById('file-input').value = '';
         document.getElementById('progress-fill').style.width = '0%';
         document.getElementById('progress-percent').textContent = '0%';
@@ -258,49 +270,65 @@ class ProjectObjectify {
         }
     }
 
-    async playVideo() {
-        if (!this.outputFile) {
+    outputFileName() {
+        return this.outputFile.split(/[\\/]/).pop();
+    }
+
+    playVideo() {
+        if (!this.jobId) {
             alert('No output file available');
             return;
         }
 
-        try {
-            const response = await fetch(`/play/${encodeURIComponent(this.outputFile)}`);
-            if (!response.ok) {
-                throw new Error('Failed to play video');
+        const player = document.getElementById('video-player');
+        player.src = `/stream/${encodeURIComponent(this.jobId)}`;
+        player.classList.remove('hidden');
+        document.getElementById('video-placeholder').classList.add('hidden');
+        player.play().catch(error => {
+            // Autoplay policy blocks are not failures, the user can press play on the controls
+            if (error.name === 'NotAllowedError') {
+                console.warn('Autoplay blocked:', error);
+                return;
             }
-            alert('Video opened in default player');
-        } catch (error) {
+            // Load and decode failures are reported once by handlePlayerError
             console.error('Play error:', error);
-            alert('Failed to play video');
+        });
+    }
+
+    handlePlayerError() {
+        const player = document.getElementById('video-player');
+        if (!player.getAttribute('src')) {
+            return;
         }
+
+        console.error('Video player error:', player.error);
+        alert('Failed to play video');
+        this.resetPlayer();
     }
 
-    async downloadVideo() {
+    resetPlayer() {
+        const player = document.getElementById('video-player');
+        player.pause();
+        player.removeAttribute('src');
+        player.load();
+        player.classList.add('hidden');
+        document.getElementById('video-placeholder').classList.remove('hidden');
+    }
+
+    downloadVideo() {
         if (!this.outputFile) {
             alert('No output file available');
             return;
         }
 
-        try {
-            const response = await fetch(`/download/${encodeURIComponent(this.outputFile)}`);
-            if (!response.ok) {
-                throw new Error('Failed to download video');
-            }
-
-            const blob = await response.blob();
-            const url = window.URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = this.outputFile;
-            document.body.appendChild(a);
-            a.click();
-            window.URL.revokeObjectURL(url);
-            document.body.removeChild(a);
-        } catch (error) {
-            console.error('Download error:', error);
-            alert('Failed to download video');
-        }
+        // Let the browser stream the file straight to disk instead of buffering it in a blob
+        const fileName = this.outputFileName();
+        const a = document.createElement('a');
+        a.href = `/download/${encodeURIComponent(fileName)}`;
+        a.download = fileName;
+        document.body.appendChild(a);
+        a.click();
+        document.body.removeChild(a);
     }
 }
 document.addEventListener('DOMContentLoaded', () => {
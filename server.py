@@ -1,10 +1,10 @@
-from flask import Flask, render_template, request, jsonify, send_file, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_file, send_from_directory
 import os
 import tempfile
 import threading
 import time
-import subprocess
-import sys
+import re
+import shutil
 from pathlib import Path
 from werkzeug.utils import secure_filename
 import uuid
@@ -15,15 +15,55 @@ from object_detection_model import VideoProcessor
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 500 * 1024 * 1024  # 500MB max file size
 
+# Hand video bodies to a front end (X-Sendfile or X-Accel-Redirect) for zero-copy delivery
+SENDFILE_HEADERS = {'x-sendfile': 'X-Sendfile', 'x-accel-redirect': 'X-Accel-Redirect'}
+sendfile_header = os.environ.get('OBJECTIFY_SENDFILE_HEADER')
+if sendfile_header and sendfile_header.lower() not in SENDFILE_HEADERS:
+    raise ValueError(
+        f"Invalid OBJECTIFY_SENDFILE_HEADER {sendfile_header!r}, expected X-Sendfile or X-Accel-Redirect"
+    )
+app.config['SENDFILE_HEADER'] = SENDFILE_HEADERS.get(sendfile_header.lower()) if sendfile_header else None
+app.config['SENDFILE_PREFIX'] = os.environ.get('OBJECTIFY_SENDFILE_PREFIX', '/protected/')
+app.config['USE_X_SENDFILE'] = app.config['SENDFILE_HEADER'] == 'X-Sendfile'
+
 # Global variables for processing state
 current_processor = None
+jobs = {}  # job_id -> VideoProcessor, oldest first, guarded by processing_lock for writes
+MAX_JOBS = 10
 processing_lock = threading.Lock()
 
 ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv', 'wmv', 'flv'}
+OUTPUT_FILENAME_RE = re.compile(r'^objectify_([0-9a-f]{8})\.mp4$')
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def send_video(path, as_attachment=False, download_name=None):
+    """Send a video file with Range, ETag and conditional request support"""
+    if app.config['SENDFILE_HEADER'] != 'X-Accel-Redirect':
+        # With USE_X_SENDFILE Flask only sets the header, otherwise the body is copied through Python
+        return send_file(
+            path,
+            mimetype='video/mp4',
+            as_attachment=as_attachment,
+            download_name=download_name,
+            conditional=True,
+            etag=True,
+            max_age=3600
+        )
+
+    # nginx reads the file itself and answers Range/conditional requests
+    response = Response(mimetype='video/mp4')
+    relative_path = os.path.relpath(path, tempfile.gettempdir()).replace(os.sep, '/')
+    response.headers['X-Accel-Redirect'] = app.config['SENDFILE_PREFIX'].rstrip('/') + '/' + relative_path
+
+    if as_attachment:
+        response.headers.set('Content-Disposition', 'attachment', filename=download_name or os.path.basename(path))
+
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600
+    return response
+
 @app.route('/')
 def index():
     """Serve the main HTML page"""
@@ -65,10 +105,17 @@ def process_video():
             input_path = os.path.join(temp_dir, filename)
             file.save(input_path)
 
-            output_filename = f"objectify_{uuid.uuid4().hex[:8]}.mp4"
+            job_id = uuid.uuid4().hex[:8]
+            output_filename = f"objectify_{job_id}.mp4"
             output_path = os.path.join(temp_dir, output_filename)
 
-            current_processor = VideoProcessor()
+            current_processor = VideoProcessor(job_id=job_id)
+            jobs[job_id] = current_processor
+            while len(jobs) > MAX_JOBS:
+                evicted = jobs.pop(next(iter(jobs)))
+                # Drop the job's upload and output along with it
+                if evicted.output_file:
+                    shutil.rmtree(os.path.dirname(evicted.output_file), ignore_errors=True)
 
             processing_thread = threading.Thread(
                 target=current_processor.process_video,
@@ -78,7 +125,7 @@ def process_video():
             )
             processing_thread.start()
 
-            return jsonify({'success': True, 'message': 'Processing started'})
+            return jsonify({'success': True, 'message': 'Processing started', 'job_id': job_id})
 
         except Exception as e:
             return jsonify({'error': f'Failed to start processing: {str(e)}'}), 500
@@ -99,46 +146,54 @@ def get_progress():
     progress_info = current_processor.get_progress()
     return jsonify(progress_info)
 
+def get_finished_job(job_id):
+    """Look up a job and return (processor, error_response)"""
+    processor = jobs.get(job_id)
+
+    if not processor or not processor.output_file:
+        return None, (jsonify({'error': 'Unknown job'}), 404)
+
+    if not processor.completed:
+        return None, (jsonify({'error': 'Video is not ready yet'}), 409)
+
+    if not processor.success:
+        return None, (jsonify({'error': processor.error or 'Processing failed'}), 410)
+
+    if not os.path.exists(processor.output_file):
+        return None, (jsonify({'error': 'Output file not found'}), 404)
+
+    return processor, None
+
 @app.route('/download/<filename>')
 def download_file(filename):
     """Download the processed video file"""
-    global current_processor
+    match = OUTPUT_FILENAME_RE.match(filename)
+    if not match:
+        return jsonify({'error': 'Unknown output file'}), 404
 
-    if not current_processor or not current_processor.output_file:
-        return jsonify({'error': 'No output file available'}), 404
+    processor, error = get_finished_job(match.group(1))
+    if error:
+        return error
 
     try:
-        if os.path.exists(current_processor.output_file):
-            return send_file(
-                current_processor.output_file,
-                as_attachment=True,
-                download_name=filename
-            )
-        else:
-            return jsonify({'error': 'Output file not found'}), 404
+        return send_video(processor.output_file, as_attachment=True, download_name=filename)
     except Exception as e:
         return jsonify({'error': f'Download failed: {str(e)}'}), 500
 
-@app.route('/play/<filename>')
-def play_file(filename):
-    """Open the processed video file in default player"""
-    global current_processor
+@app.route('/stream/<job_id>')
+def stream_file(job_id):
+    """Stream the processed video for inline playback in the browser"""
+    processor, error = get_finished_job(job_id)
+    if error:
+        return error
 
-    if not current_processor or not current_processor.output_file:
-        return jsonify({'error': 'No output file available'}), 404
+    if not processor.playable:
+        return jsonify({'error': 'Video is not playable in the browser, download it instead'}), 415
 
     try:
-        if os.path.exists(current_processor.output_file):
-            if os.name == 'nt':  # Windows
-                os.startfile(current_processor.output_file)
-            elif os.name == 'posix':  # macOS and Linux
-                subprocess.call(['open' if sys.platform == 'darwin' else 'xdg-open', current_processor.output_file])
-
-            return jsonify({'success': True, 'message': 'Video opened in default player'})
-        else:
-            return jsonify({'error': 'Output file not found'}), 404
+        return send_video(processor.output_file)
     except Exception as e:
-        return jsonify({'error': f'Failed to open video: {str(e)}'}), 500
+        return jsonify({'error': f'Streaming failed: {str(e)}'}), 500
 
 @app.route('/status')
 def status():